@@ -366,9 +366,9 @@ class DouDigestDagGenerator:
             skip_notification = True
 
             for search in search_results:
-                items = ["contains" for k, v in search["result"].items() if v]
-                if items:
+                if any(search["result"].values()):
                     skip_notification = False
+                    break
             return "skip_notification" if skip_notification else "send_notification"
         else:
             return "send_notification"
@@ -2,7 +2,7 @@ import re
 
 import requests
 
-from notification.isender import ISender
+from .isender import ISender
 from schemas import ReportConfig
 
 
@@ -1,29 +1,50 @@
 """Module for sending emails.
 """
 
+import csv
+import io
 import os
-import sys
 from tempfile import NamedTemporaryFile
-import textwrap
+from typing import Iterator, List, Optional, Tuple
 
-import markdown
 import pandas as pd
 from airflow.utils.email import send_email
 
-# TODO fix this
-# Add parent folder to sys.path in order to be able to import
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
-
-from notification.isender import ISender
 from schemas import ReportConfig
+from .isender import ISender
+
+STYLE_FILE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "report_style.css"
+)
+
+REPORT_COLUMNS = (
+    "Consulta",
+    "Grupo",
+    "Termo de pesquisa",
+    "Unidade",
+    "Seção",
+    "URL",
+    "Título",
+    "Resumo",
+    "Data",
+)
+
+_HTML_ESC = str.maketrans(
+    {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}
+)
+
+
+def _e(s: str) -> str:
+    """Escape a text field to be interpolated into the HTML report."""
+    return s.translate(_HTML_ESC) if s else ""
 
 
 class EmailSender(ISender):
     """Prepare and send e-mails with the reports."""
 
     highlight_tags = ("<span class='highlight' style='background:#FFA;'>", "</span>")
+    # report_style.css is static, so it is read only once per process
+    _STYLE_BLOCK: Optional[str] = None
 
     def __init__(self, report_config: ReportConfig) -> None:
         self.report_config = report_config
@@ -38,84 +59,85 @@ class EmailSender(ISender):
         """Builds the email content, the CSV if applies, and send it"""
         self.search_report = search_report
         full_subject = f"{self.report_config.subject} - DOs de {report_date}"
-        skip_notification = True
-        for search in self.search_report:
-            items = ["contains" for k, v in search["result"].items() if v]
-            if items:
-                skip_notification = False
-            else:
-                content = self.report_config.no_results_found_text
+        content, any_hits = self.generate_email_content()
+        skip_notification = not any_hits
 
         if skip_notification:
             if self.report_config.skip_null:
                 return "skip_notification"
-        else:
-            content = self.generate_email_content()
+            content = self.report_config.no_results_found_text
 
         content += self.watermark
 
         if self.report_config.attach_csv and skip_notification is False:
             with self.get_csv_tempfile() as csv_file:
-                send_email(
-                    to=self.report_config.emails,
-                    subject=full_subject,
-                    files=[csv_file.name],
-                    html_content=content,
-                    mime_charset="utf-8",
-                )
+                self._send_email(full_subject, content, files=[csv_file.name])
         else:
-            send_email(
-                to=self.report_config.emails,
-                subject=full_subject,
-                html_content=content,
-                mime_charset="utf-8",
-            )
-
-    def generate_email_content(self) -> str:
+            self._send_email(full_subject, content)
+
+    def _send_email(
+        self, subject: str, content: str, files: Optional[List[str]] = None
+    ):
+        """Delivers the email through Airflow's configured email backend."""
+        send_email(
+            to=self.report_config.emails,
+            subject=subject,
+            files=files,
+            html_content=content,
+            mime_charset="utf-8",
+        )
+
+    def generate_email_content(self) -> Tuple[str, bool]:
         """Generate HTML content to be sent by email based on
         search_report dictionary
+
+        Returns:
+            Tuple[str, bool]: the HTML content and whether any search
+                group has results.
         """
 
-        current_directory = os.path.dirname(__file__)
-        parent_directory = os.path.dirname(current_directory)
-        file_path = os.path.join(parent_directory, "report_style.css")
+        if EmailSender._STYLE_BLOCK is None:
+            with open(STYLE_FILE_PATH, "r", encoding="utf-8") as f:
+                EmailSender._STYLE_BLOCK = f"<style>\n{f.read()}</style>"
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            blocks = [f"<style>\n{f.read()}</style>"]
+        any_hits = False
+        buf = io.StringIO()
+        buf.write(EmailSender._STYLE_BLOCK)
+        buf.write("\n")
 
         if self.report_config.header_text:
-            blocks.append(self.report_config.header_text)
+            buf.write(self.report_config.header_text)
+            buf.write("\n")
 
         for search in self.search_report:
 
             if search["header"]:
-                blocks.append(f"<h1>{search['header']}</h1>")
+                buf.write(f"<h1>{search['header']}</h1>\n")
 
             if not self.report_config.hide_filters:
                 if search["department"]:
-                    blocks.append(
-                        """<p class="secao-marker">Filtrando resultados somente para:</p>"""
+                    buf.write(
+                        """<p class="secao-marker">Filtrando resultados somente para:</p>\n"""
+                    )
+                    buf.write(
+                        "<ul>\n"
+                        + "".join([f"<li>{dpt}</li>\n" for dpt in search["department"]])
+                        + "</ul>\n"
                     )
-                    blocks.append("<ul>")
-                    for dpt in search["department"]:
-                        blocks.append(f"<li>{dpt}</li>")
-                    blocks.append("</ul>")
 
             for group, search_results in search["result"].items():
 
                 if not search_results:
-                    blocks.append(f"<p>{self.report_config.no_results_found_text}.</p>")
+                    buf.write(f"<p>{self.report_config.no_results_found_text}.</p>\n")
                 else:
+                    any_hits = True
                     if not self.report_config.hide_filters:
                         if group != "single_group":
-                            blocks.append("\n")
-                            blocks.append(f"**Grupo: {group}**")
-                            blocks.append("\n\n")
+                            buf.write(f"<h2>Grupo: {group}</h2>\n")
 
                     for term, term_results in search_results.items():
-                        blocks.append("\n")
                         if not self.report_config.hide_filters:
-                            blocks.append(f"* # Resultados para: {term}")
+                            buf.write(f"<h3>Resultados para: {term}</h3>\n")
 
                         for department, results in term_results.items():
 
@@ -123,51 +145,83 @@ class EmailSender(ISender):
                                 not self.report_config.hide_filters
                                 and department != "single_department"
                             ):
-                                blocks.append(f"**{department}**")
+                                buf.write(f"<p><strong>{department}</strong></p>\n")
 
                             for result in results:
                                 if not self.report_config.hide_filters:
-                                    sec_desc = result["section"]
-                                    item_html = f"""
-                                        <p class="secao-marker">{sec_desc}</p>
-                                        ### [{result['title']}]({result['href']})
-                                        <p style='text-align:justify' class='abstract-marker'>{result['abstract']}</p>
-                                        <p class='date-marker'>{result['date']}</p>"""
-                                    blocks.append(
-                                        textwrap.indent(
-                                            textwrap.dedent(item_html), " " * 4
-                                        )
+                                    buf.write(
+                                        f"<p class=\"secao-marker\">{_e(result['section'])}</p>\n"
+                                        f"<h4><a href=\"{_e(result['href'])}\">{_e(result['title'])}</a></h4>\n"
+                                        f"<p style='text-align:justify' class='abstract-marker'>{result['abstract']}</p>\n"
+                                        f"<p class='date-marker'>{result['date']}</p>\n"
                                     )
                                 else:
-                                    item_html = f"""
-                                        ### [{result['title']}]({result['href']})
-                                        <p style='text-align:justify' class='abstract-marker'>{result['abstract']}</p><br><br>"""
-                                    blocks.append(textwrap.dedent(item_html))
+                                    buf.write(
+                                        f"<h4><a href=\"{_e(result['href'])}\">{_e(result['title'])}</a></h4>\n"
+                                        f"<p style='text-align:justify' class='abstract-marker'>{result['abstract']}</p><br><br>\n"
+                                    )
 
-        blocks.append("---")
+        buf.write("<hr>\n")
         if self.report_config.footer_text:
-            blocks.append(self.report_config.footer_text)
+            buf.write(self.report_config.footer_text)
+            buf.write("\n")
 
-        return markdown.markdown("\n".join(blocks))
+        return buf.getvalue(), any_hits
 
     def get_csv_tempfile(self) -> NamedTemporaryFile:
-        temp_file = NamedTemporaryFile(prefix="extracao_dou_", suffix=".csv")
-        self.convert_report_to_dataframe().to_csv(temp_file, index=False)
+        temp_file = NamedTemporaryFile(
+            mode="w",
+            encoding="utf-8",
+            newline="",
+            prefix="extracao_dou_",
+            suffix=".csv",
+        )
+        columns, rows = self._filtered_report_rows()
+        writer = csv.writer(temp_file, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(rows)
+        temp_file.flush()
         return temp_file
 
     def convert_report_to_dataframe(self) -> pd.DataFrame:
-        df = pd.DataFrame(self.convert_report_dict_to_tuple_list())
-        df.columns = [
-            "Consulta",
-            "Grupo",
-            "Termo de pesquisa",
-            "Unidade",
-            "Seção",
-            "URL",
-            "Título",
-            "Resumo",
-            "Data",
-        ]
+        columns, rows = self._filtered_report_rows()
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def _filtered_report_rows(self) -> Tuple[List[str], Iterator[tuple]]:
+        """Returns the report column names without the empty or default
+        ones, and a generator of the rows restricted to those columns.
+        """
+        del_header, del_single_group, del_single_department = self._report_flags()
+        dropped = set()
+        if del_header:
+            dropped.add(0)
+        if del_single_group:
+            dropped.add(1)
+        if del_single_department:
+            dropped.add(3)
+        kept = [i for i in range(len(REPORT_COLUMNS)) if i not in dropped]
+        columns = [REPORT_COLUMNS[i] for i in kept]
+
+        # Default values replaced with blank, by column index
+        blank = {1: "single_group", 3: "single_department"}
+
+        def rows():
+            for row in self.iter_report_rows():
+                yield tuple(
+                    "" if i in blank and row[i] == blank[i] else row[i]
+                    for i in kept
+                )
+
+        return columns, rows()
+
+    def _report_flags(self) -> Tuple[bool, bool, bool]:
+        """Detects which optional columns are empty or default, walking
+        search_report down to the departments only.
+
+        Returns:
+            Tuple[bool, bool, bool]: the flags del_header,
+                del_single_group and del_single_department.
+        """
         del_header = True
         del_single_group = True
         del_single_department = True
@@ -175,58 +229,33 @@ class EmailSender(ISender):
         for search in self.search_report:
             if search["header"] is not None:
                 del_header = False
-
-            for group, search_result in search["result"].items():
+            for group, results in search["result"].items():
                 if group != "single_group":
                     del_single_group = False
-                for _, term_results in search_result.items():
-                    for dpt,_ in term_results.items():
-                        if dpt != "single_department":
+                for departments in results.values():
+                    for department in departments:
+                        if department != "single_department":
                             del_single_department = False
+        return del_header, del_single_group, del_single_department
 
-        # Drop empty or default columns
-        if del_header:
-            del df["Consulta"]
-
-        if del_single_group:
-            del df["Grupo"]
-        else:
-            # Replace single_group with blank
-            df["Grupo"] = df["Grupo"].replace("single_group", "")
-
-        if del_single_department:
-            del df["Unidade"]
-        else:
-            # Replace single_group with blank
-            df["Unidade"] = df["Unidade"].replace("single_department", "")
-
-        return df
-
-    def convert_report_dict_to_tuple_list(self) -> list:
-        tuple_list = []
+    def iter_report_rows(self) -> Iterator[tuple]:
+        """Yields one tuple per match in search_report, with the columns
+        listed in REPORT_COLUMNS.
+        """
         for search in self.search_report:
             header = search["header"] if search["header"] else None
             for group, results in search["result"].items():
                 for term, departments in results.items():
                     for department, dpt_matches in departments.items():
                         for match in dpt_matches:
-                            tuple_list.append(
-                                repack_match(header, group, term, department, match)
+                            yield (
+                                header,
+                                group,
+                                term,
+                                department,
+                                match["section"],
+                                match["href"],
+                                match["title"],
+                                match["abstract"],
+                                match["date"],
                             )
-        return tuple_list
-
-
-def repack_match(
-    header: str, group: str, search_term: str, department: str, match: dict
-) -> tuple:
-    return (
-        header,
-        group,
-        search_term,
-        department,
-        match["section"],
-        match["href"],
-        match["title"],
-        match["abstract"],
-        match["date"],
-    )
@@ -1,20 +1,10 @@
-import ast
-import os
-import sys
-
-# TODO fix this
-# Add parent folder to sys.path in order to be able to import
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-sys.path.insert(0, parent_dir)
-
 from typing import List
 
-from notification.discord_sender import DiscordSender
-from notification.email_sender import EmailSender
-from notification.isender import ISender
-from notification.slack_sender import SlackSender
 from parsers import DAGConfig
+from .discord_sender import DiscordSender
+from .email_sender import EmailSender
+from .isender import ISender
+from .slack_sender import SlackSender
 
 
 class Notifier:
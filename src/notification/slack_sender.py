@@ -5,9 +5,39 @@ from datetime import datetime
 import re
 
 import requests
-from notification.isender import ISender
+from requests.adapters import HTTPAdapter
 
 from schemas import ReportConfig
+from .isender import ISender
+
+# Shared session so every webhook call reuses pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Maximum number of blocks accepted by Slack in a single message
+MAX_BLOCKS_PER_MESSAGE = 50
+
+# Static parts of the blocks. They are shared between items and never
+# mutated, only serialized when the message is posted.
+_DIVIDER = {"type": "divider"}
+_BUTTON_TEMPLATE = {
+    "type": "button",
+    "text": {
+        "type": "plain_text",
+        "text": "Acessar publicação",
+        "emoji": True,
+    },
+    "value": "click_me_123",
+    "action_id": "button-action",
+}
+# Title, abstract and publication date sections followed by a divider.
+# The text of each section and the button url are filled per item.
+_ITEM_TEMPLATE = (
+    {"type": "section", "text": {"type": "mrkdwn"}},
+    {"type": "section", "text": {"type": "mrkdwn"}},
+    {"type": "section", "text": {"type": "mrkdwn"}, "accessory": _BUTTON_TEMPLATE},
+    _DIVIDER,
+)
 
 
 class SlackSender(ISender):
@@ -68,43 +98,28 @@ class SlackSender(ISender):
         )
 
     def _add_text(self, text):
-        self.blocks += [
-            {
-                "type": "section",
-                "text": {"type": "plain_text", "text": text, "emoji": True},
-            },
-            {"type": "divider"},
-        ]
+        self.blocks.extend(
+            (
+                {
+                    "type": "section",
+                    "text": {"type": "plain_text", "text": text, "emoji": True},
+                },
+                _DIVIDER,
+            )
+        )
 
     def _add_block(self, item):
-        self.blocks += [
-            {"type": "section", "text": {"type": "mrkdwn", "text": item["title"]}},
-            {"type": "section", "text": {"type": "mrkdwn", "text": item["abstract"]}},
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"Publicado em: *{_format_date(item['date'])}*",
-                },
-                "accessory": {
-                    "type": "button",
-                    "text": {
-                        "type": "plain_text",
-                        "text": "Acessar publicação",
-                        "emoji": True,
-                    },
-                    "value": "click_me_123",
-                    "url": item["href"],
-                    "action_id": "button-action",
-                },
-            },
-            {"type": "divider"},
-        ]
+        title, abstract, date, divider = _ITEM_TEMPLATE
+        title = _fill_section(title, item["title"])
+        abstract = _fill_section(abstract, item["abstract"])
+        date = _fill_section(date, f"Publicado em: *{_format_date(item['date'])}*")
+        date["accessory"] = {**_BUTTON_TEMPLATE, "url": item["href"]}
+        self.blocks.extend((title, abstract, date, divider))
 
     def _flush(self):
-        for i in range(0, len(self.blocks), 50):
-            data = {"blocks": self.blocks[i : i + 50]}
-            result = requests.post(self.webhook_url, json=data)
+        for i in range(0, len(self.blocks), MAX_BLOCKS_PER_MESSAGE):
+            data = {"blocks": self.blocks[i : i + MAX_BLOCKS_PER_MESSAGE]}
+            result = _SESSION.post(self.webhook_url, json=data)
             result.raise_for_status()
 
 
@@ -119,6 +134,13 @@ WEEKDAYS_EN_TO_PT = [
 ]
 
 
+def _fill_section(template: dict, text: str) -> dict:
+    """Copies a section block template setting its text."""
+    section = template.copy()
+    section["text"] = {**template["text"], "text": text}
+    return section
+
+
 def _format_date(date_str: str) -> str:
     date = datetime.strptime(date_str, "%d/%m/%Y")
     _from, _to = WEEKDAYS_EN_TO_PT[date.weekday()]
@@ -14,6 +14,10 @@ from airflow.models import Variable
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 from schemas import RoDouConfig, DAGConfig
 
+# libyaml based loader, falling back to the pure-Python one when PyYAML
+# is built without the libyaml bindings
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class YAMLParser:
     """Parses YAML file and get the DAG parameters.
@@ -28,7 +32,7 @@ class YAMLParser:
     def read(self) -> dict:
         """Reads the contents of the YAML file."""
         with open(self.filepath, "r", encoding="utf-8") as file:
-            dag_config_dict = yaml.safe_load(file)
+            dag_config_dict = yaml.load(file, Loader=_YAML_LOADER)
         return dag_config_dict
 
     def parse(self) -> DAGConfig:
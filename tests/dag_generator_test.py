@@ -4,29 +4,12 @@
 import pandas as pd
 import pytest
 from dags.ro_dou_src.dou_dag_generator import merge_results
-from dags.ro_dou_src.notification.email_sender import EmailSender, repack_match
+from dags.ro_dou_src.notification.email_sender import EmailSender
+from dags.ro_dou_src.schemas import ReportConfig
 from airflow import Dataset
 from airflow.timetables.datasets import DatasetOrTimeSchedule
 
 
-def test_repack_match(report_example):
-    match_dict = report_example[0]["result"]["single_group"]["antonio de oliveira"]["single_department"][0]
-    repacked_match = repack_match(
-        "Teste Report", "single_group", "antonio de oliveira", "single_department", match_dict
-    )
-    assert repacked_match == (
-        "Teste Report",
-        "single_group",
-        "antonio de oliveira",
-        "single_department",
-        "Seção 3",
-        match_dict["href"],
-        match_dict["title"],
-        match_dict["abstract"],
-        match_dict["date"],
-    )
-
-
 @pytest.fixture
 def email_sender(report_example):
     email_sender = EmailSender(None)
@@ -34,21 +17,34 @@ def email_sender(report_example):
     return email_sender
 
 
-def test_convert_report_dict__returns_list(email_sender):
-    tuple_list = email_sender.convert_report_dict_to_tuple_list()
-    assert isinstance(tuple_list, list)
+def test_iter_report_rows__returns_iterator(email_sender):
+    rows = email_sender.iter_report_rows()
+    assert iter(rows) is rows
 
 
-def test_convert_report_dict__returns_tuples(email_sender):
-    tuple_list = email_sender.convert_report_dict_to_tuple_list()
-    for tpl in tuple_list:
-        assert isinstance(tpl, tuple)
+def test_iter_report_rows__returns_tuples(email_sender):
+    for row in email_sender.iter_report_rows():
+        assert isinstance(row, tuple)
 
 
-def test_convert_report_dict__returns_tuples_of_nine(email_sender):
-    tuple_list = email_sender.convert_report_dict_to_tuple_list()
-    for tpl in tuple_list:
-        assert len(tpl) == 9
+def test_iter_report_rows__returns_tuples_of_nine(email_sender):
+    for row in email_sender.iter_report_rows():
+        assert len(row) == 9
+
+
+def test_iter_report_rows__values(email_sender, report_example):
+    match_dict = report_example[0]["result"]["single_group"]["antonio de oliveira"]["single_department"][0]
+    assert next(email_sender.iter_report_rows()) == (
+        "Teste Report",
+        "single_group",
+        "antonio de oliveira",
+        "single_department",
+        "Seção 3",
+        match_dict["href"],
+        match_dict["title"],
+        match_dict["abstract"],
+        match_dict["date"],
+    )
 
 
 def test_convert_report_to_dataframe__rows_count(email_sender):
@@ -103,6 +99,110 @@ def test_get_csv_tempfile__valid_csv(email_sender):
         assert pd.read_csv(csv_file.name) is not None
 
 
+def _empty_report() -> list:
+    return [
+        {
+            "header": None,
+            "department": None,
+            "result": {"single_group": {}},
+        }
+    ]
+
+
+def test_generate_email_content__no_hits():
+    email_sender = EmailSender(ReportConfig())
+    email_sender.search_report = _empty_report()
+    _, any_hits = email_sender.generate_email_content()
+    assert any_hits is False
+
+
+def test_generate_email_content__html_with_hits(report_example):
+    report_example[0]["result"]["group_name"] = report_example[0]["result"].pop(
+        "single_group"
+    )
+    email_sender = EmailSender(ReportConfig())
+    email_sender.search_report = report_example
+    content, any_hits = email_sender.generate_email_content()
+    assert any_hits is True
+    assert "<h2>Grupo: group_name</h2>" in content
+    assert "<h3>Resultados para: antonio de oliveira</h3>" in content
+    assert '<h4><a href="https://www.in.gov.br/' in content
+    assert "<hr>" in content
+    assert "**" not in content
+    assert "###" not in content
+    assert "* # " not in content
+
+
+def test_generate_email_content__escapes_item_fields():
+    email_sender = EmailSender(ReportConfig())
+    email_sender.search_report = [
+        {
+            "header": None,
+            "department": None,
+            "result": {
+                "single_group": {
+                    "termo": {
+                        "single_department": [
+                            {
+                                "section": 'Seção "1" <a> & <b>',
+                                "title": 'Título "A" <script> & B',
+                                "href": 'https://x.gov.br/?a=1&b="2"<>',
+                                "abstract": "Resumo com <span class='highlight' "
+                                "style='background:#FFA;'>termo</span> & outro",
+                                "date": "27/08/2021",
+                            }
+                        ]
+                    }
+                }
+            },
+        }
+    ]
+    content, _ = email_sender.generate_email_content()
+    assert "Seção &quot;1&quot; &lt;a&gt; &amp; &lt;b&gt;" in content
+    assert "Título &quot;A&quot; &lt;script&gt; &amp; B" in content
+    assert 'href="https://x.gov.br/?a=1&amp;b=&quot;2&quot;&lt;&gt;"' in content
+    assert (
+        "Resumo com <span class='highlight' style='background:#FFA;'>"
+        "termo</span> & outro"
+    ) in content
+
+
+def test_send__no_results_sends_no_results_found_text(mocker):
+    send_email = mocker.patch(
+        "dags.ro_dou_src.notification.email_sender.send_email"
+    )
+    email_sender = EmailSender(
+        ReportConfig(emails=["rodou@economia.gov.br"], skip_null=False)
+    )
+    email_sender.send(_empty_report(), "01/01/2024")
+    html_content = send_email.call_args.kwargs["html_content"]
+    assert html_content.startswith(ReportConfig().no_results_found_text)
+    assert "<h4>" not in html_content
+
+
+def test_send__skip_null_returns_skip_notification(mocker):
+    send_email = mocker.patch(
+        "dags.ro_dou_src.notification.email_sender.send_email"
+    )
+    email_sender = EmailSender(
+        ReportConfig(emails=["rodou@economia.gov.br"], skip_null=True)
+    )
+    assert email_sender.send(_empty_report(), "01/01/2024") == "skip_notification"
+    send_email.assert_not_called()
+
+
+def test_send__empty_search_report(mocker):
+    send_email = mocker.patch(
+        "dags.ro_dou_src.notification.email_sender.send_email"
+    )
+    email_sender = EmailSender(
+        ReportConfig(emails=["rodou@economia.gov.br"], skip_null=False)
+    )
+    email_sender.send([], "01/01/2024")
+    html_content = send_email.call_args.kwargs["html_content"]
+    assert html_content.startswith(ReportConfig().no_results_found_text)
+
+
 def test_merge_results(merge_results_samples):
     merged_result = merge_results(
         merge_results_samples[0],
@@ -0,0 +1,101 @@
+from collections import namedtuple
+
+import pytest
+from dags.ro_dou_src.notification.slack_sender import (
+    MAX_BLOCKS_PER_MESSAGE,
+    SlackSender,
+    _ITEM_TEMPLATE,
+    _SESSION,
+)
+from pytest_mock import MockerFixture
+
+WEBHOOK = "https://some-url.com/xxx"
+
+
+@pytest.fixture
+def mocked_specs():
+    Specs = namedtuple(
+        "Specs",
+        [
+            "slack",
+            "hide_filters",
+            "header_text",
+            "footer_text",
+            "no_results_found_text",
+        ],
+    )
+    return Specs(
+        {"webhook": WEBHOOK},
+        False,
+        None,
+        None,
+        "Nenhum dos termos pesquisados foi encontrado nesta consulta.",
+    )
+
+
+def test_add_block(mocked_specs):
+    sender = SlackSender(mocked_specs)
+    items = [
+        {
+            "title": "some title",
+            "abstract": "some abstract",
+            "href": "http://some-link.com",
+            "date": "15/03/2023",
+        },
+        {
+            "title": "another title",
+            "abstract": "another abstract",
+            "href": "http://another-link.com",
+            "date": "16/03/2023",
+        },
+    ]
+    for item in items:
+        sender._add_block(item)
+
+    assert len(sender.blocks) == 8
+    for item, expected_date, blocks in zip(
+        items, ("Qua 15/03", "Qui 16/03"), (sender.blocks[:4], sender.blocks[4:])
+    ):
+        title, abstract, date, divider = blocks
+        assert title == {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": item["title"]},
+        }
+        assert abstract == {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": item["abstract"]},
+        }
+        assert date["text"]["text"] == f"Publicado em: *{expected_date}*"
+        assert date["accessory"]["url"] == item["href"]
+        assert divider == {"type": "divider"}
+
+    # The shared templates must not carry any item data
+    assert "text" not in _ITEM_TEMPLATE[0]["text"]
+    assert "url" not in _ITEM_TEMPLATE[2]["accessory"]
+
+
+def test_flush_posts_chunks_through_session(
+    session_mocker: MockerFixture, mocked_specs
+):
+    session_mocker.patch(
+        "dags.ro_dou_src.notification.slack_sender._SESSION.post"
+    )
+    sender = SlackSender(mocked_specs)
+    item = {
+        "title": "some title",
+        "abstract": "some abstract",
+        "href": "http://some-link.com",
+        "date": "15/03/2023",
+    }
+    # 30 items of 4 blocks each
+    for _ in range(30):
+        sender._add_block(item)
+    sender._flush()
+
+    assert MAX_BLOCKS_PER_MESSAGE == 50
+    assert _SESSION.post.call_count == 3
+    posted = [call.kwargs["json"]["blocks"] for call in _SESSION.post.call_args_list]
+    assert [len(blocks) for blocks in posted] == [50, 50, 20]
+    assert [block for blocks in posted for block in blocks] == sender.blocks
+    for call in _SESSION.post.call_args_list:
+        assert call.args == (WEBHOOK,)